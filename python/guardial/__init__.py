@@ -11,61 +11,377 @@ Features:
 
 import os
 import json
+import re
 import time
-import uuid
+import queue
+import atexit
+import secrets
+import asyncio
+import hashlib
+import inspect
+import threading
+from concurrent.futures import Future
+import orjson
 import requests
-from typing import Dict, Optional, Callable, Any
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Dict, Optional, Callable, Any, Sequence, Tuple
 from functools import wraps
+from contextlib import asynccontextmanager
+from collections import OrderedDict
+
+# Optional framework integrations, resolved once at import time
+try:
+    from fastapi import HTTPException as _FastAPIHTTPException, Response as _FastAPIResponse
+except ImportError:
+    _FastAPIHTTPException = _FastAPIResponse = None
+
+try:
+    from starlette.requests import HTTPConnection as _StarletteHTTPConnection, Request as _StarletteRequest
+except ImportError:
+    _StarletteHTTPConnection = _StarletteRequest = None
+
+try:
+    from flask import request as _flask_request, abort as _flask_abort
+except ImportError:
+    _flask_request = _flask_abort = None
+
+_AUTH_HEADER_SET = frozenset(('authorization', 'x-api-key', 'x-auth-token'))
+
+# Queue sentinel asking a drainer to ship what it holds and stop
+_STOP = object()
+
+def _dumps(obj) -> bytes:
+    """orjson encode, falling back to stdlib json for input orjson rejects (lone surrogates, >64-bit ints)"""
+    try:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    except TypeError:
+        return json.dumps(obj, separators=(',', ':')).encode()
+
+def _user_agent(headers: Dict) -> str:
+    """User agent from an already-materialized headers dict (Starlette or Werkzeug casing)"""
+    return headers.get('user-agent') or headers.get('User-Agent') or ''
 
 class GuardialConfig:
     def __init__(self, api_key: Optional[str] = None, endpoint: Optional[str] = None,
-                 customer_id: Optional[str] = None, debug: bool = False, timeout: int = 30):
+                 customer_id: Optional[str] = None, debug: bool = False, timeout: int = 30,
+                 mode: Optional[str] = None, batch_size: int = 64, flush_interval: float = 0.05,
+                 max_queue_size: int = 10000, max_body_bytes: int = 16384,
+                 local_policy: bool = False, policy_refresh_interval: float = 300,
+                 cache_size: int = 10000, cache_ttl: float = 60,
+                 header_whitelist: Optional[Sequence[str]] = None):
         # Auto-detect from environment variables
         self.api_key = api_key or os.getenv('GUARDIAL_API_KEY', '')
         self.endpoint = endpoint or os.getenv('GUARDIAL_ENDPOINT', 'https://api.guardial.in')
+        # Endpoint URLs, formatted once
+        self.events_url = f"{self.endpoint}/api/events"
+        self.batch_url = f"{self.endpoint}/api/events/batch"
+        self.policy_url = f"{self.endpoint}/api/policy"
+        self.llm_url = f"{self.endpoint}/api/llm/guard"
+        self.health_url = f"{self.endpoint}/health"
         self.customer_id = customer_id or os.getenv('GUARDIAL_CUSTOMER_ID', 'default')
         self.debug = debug or os.getenv('GUARDIAL_DEBUG', 'false').lower() == 'true'
         self.timeout = timeout
-        self.session_id = f"session_{int(time.time())}_{uuid.uuid4().hex[:9]}"
+        self.session_id = "session_" + secrets.token_hex(8)
+        # "inline" blocks on each verdict; "async" queues events and ships them in batches
+        self.mode = mode or os.getenv('GUARDIAL_MODE', 'inline')
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue_size = max_queue_size
+        # Only the first max_body_bytes of a request body are sent for analysis
+        self.max_body_bytes = max_body_bytes
+        # Local allow/deny prefilter fetched from /api/policy; skips the API for allow-listed safe requests
+        self.local_policy = local_policy or os.getenv('GUARDIAL_LOCAL_POLICY', 'false').lower() == 'true'
+        self.policy_refresh_interval = policy_refresh_interval
+        # Allow verdicts for identical requests are reused for cache_ttl seconds (cache_size=0 disables)
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        # When set, only these headers (case-insensitive) are sent to Guardial
+        self.header_whitelist = frozenset(h.lower() for h in header_whitelist) if header_whitelist else None
         
         if not self.api_key:
             raise ValueError("GUARDIAL_API_KEY environment variable is required or pass api_key parameter")
+        if self.mode not in ('inline', 'async'):
+            raise ValueError("mode must be 'inline' or 'async'")
+
+class _TTLCache:
+    """Thread-safe LRU cache whose entries expire after ttl seconds"""
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[bytes, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: bytes) -> Optional[Dict]:
+        if self.maxsize <= 0:
+            return None
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires, value = item
+            if expires < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+    
+    def set(self, key: bytes, value: Dict) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
 
 class GuardialClient:
+    # Fetch the local policy synchronously at construction
+    _fetch_policy_on_init = True
+    
     def __init__(self, config: Optional[GuardialConfig] = None):
         self.config = config or GuardialConfig()
+        # Persistent session: keep-alive + connection pooling across calls
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=128,
+            max_retries=Retry(total=2, backoff_factor=0.1, status_forcelist=[502, 503, 504])
+        )
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        self._session.headers.update({
+            "X-API-Key": self.config.api_key,
+            "Content-Type": "application/json"
+        })
+        # Invariant event fields, pre-encoded once as the opening of every event object
+        self._event_prefix = orjson.dumps({
+            "customer_id": self.config.customer_id,
+            "session_id": self.config.session_id
+        })[:-1] + b','
+        # Background telemetry queue (async mode), drained lazily by a worker thread
+        self._queue: "queue.Queue[Dict]" = queue.Queue(maxsize=self.config.max_queue_size)
+        self._worker: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()
+        # Local policy prefilter, compiled from the server policy
+        self._deny_re: Optional["re.Pattern"] = None
+        self._allow_re: Optional["re.Pattern"] = None
+        self._policy_version: Optional[str] = None
+        self._policy_expires = 0.0
+        # Verdict cache for repeated identical requests
+        self._cache = _TTLCache(self.config.cache_size, self.config.cache_ttl)
+        # In-flight analyses by event key, so concurrent duplicates share one API call
+        self._inflight: Dict[bytes, Future] = {}
+        self._inflight_lock = threading.Lock()
+        if self.config.local_policy and self._fetch_policy_on_init:
+            self._refresh_policy()
     
     def analyze_event(self, method: str, path: str, source_ip: str, 
                      user_agent: Optional[str] = None, headers: Optional[Dict] = None,
-                     query_params: Optional[str] = None, request_body: Optional[str] = None) -> Dict:
+                     query_params: Optional[str] = None, request_body: Optional[str] = None,
+                     body_truncated: bool = False) -> Dict:
         """Analyze a security event"""
-        event = {
-            "method": method,
-            "path": path,
-            "source_ip": source_ip,
-            "user_agent": user_agent or "",
-            "headers": headers or {},
-            "query_params": query_params or "",
-            "request_body": request_body or "",
-            "customer_id": self.config.customer_id,
-            "has_auth": self._has_auth_headers(headers or {}),
-            "session_id": self.config.session_id
-        }
+        if self.config.local_policy:
+            if time.monotonic() >= self._policy_expires:
+                self._refresh_policy()
+            verdict = self._local_verdict(path, query_params, user_agent, headers, request_body)
+            if verdict is not None:
+                return verdict
+        
+        try:
+            event = self._build_event(method, path, source_ip, user_agent, headers,
+                                      query_params, request_body, body_truncated)
+            fields = self._encode_fields(event)
+            key = self._event_key(fields)
+        except Exception as e:
+            if self.config.debug:
+                print(f"[Guardial SDK] Analysis failed: {e}")
+            return {"allowed": True, "error": str(e)}
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+        
+        # Coalesce concurrent identical requests onto a single API call
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+        if not leader:
+            return future.result()
         
         try:
-            response = requests.post(
-                f"{self.config.endpoint}/api/events",
-                json=event,
-                headers={"X-API-Key": self.config.api_key},
+            verdict = self._post_event(key, self._event_prefix + fields[1:])
+            future.set_result(verdict)
+            return verdict
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                del self._inflight[key]
+    
+    def _post_event(self, key: bytes, payload: bytes) -> Dict:
+        """Send an encoded event to the API and cache allow verdicts"""
+        try:
+            response = self._session.post(
+                self.config.events_url,
+                data=payload,
                 timeout=self.config.timeout
             )
             response.raise_for_status()
-            return response.json()
+            verdict = orjson.loads(response.content)
+            # Only cache allows so blocked clients are re-evaluated on retry
+            if verdict.get('allowed', True):
+                self._cache.set(key, verdict)
+            return verdict
         except Exception as e:
             if self.config.debug:
                 print(f"[Guardial SDK] Analysis failed: {e}")
             return {"allowed": True, "error": str(e)}
     
+    def _refresh_policy(self) -> None:
+        """Fetch and compile the local allow/deny policy"""
+        self._policy_expires = time.monotonic() + self.config.policy_refresh_interval
+        try:
+            response = self._session.get(
+                self.config.policy_url,
+                timeout=self.config.timeout
+            )
+            response.raise_for_status()
+            self._apply_policy(orjson.loads(response.content))
+        except Exception as e:
+            if self.config.debug:
+                print(f"[Guardial SDK] Policy refresh failed: {e}")
+    
+    def _apply_policy(self, policy: Dict) -> None:
+        """Compile deny patterns into one regex and allow paths into a prefix matcher"""
+        deny = policy.get('deny_patterns') or []
+        allow = policy.get('allow_paths') or []
+        deny_re = re.compile("|".join(f"(?:{p})" for p in deny), re.IGNORECASE) if deny else None
+        allow_re = _compile_prefixes(allow) if allow else None
+        self._deny_re, self._allow_re = deny_re, allow_re
+        self._policy_version = policy.get('version')
+    
+    def _local_verdict(self, path: str, query_params: Optional[str], user_agent: Optional[str],
+                       headers: Optional[Dict], request_body: Optional[str]) -> Optional[Dict]:
+        """Allow verdict for allow-listed paths with no deny match, else None to defer to the API"""
+        if self._allow_re is None or not self._allow_re.match(path):
+            return None
+        if user_agent is None:
+            user_agent = _user_agent(headers or {})
+        if self._deny_re is not None and self._deny_re.search(
+                f"{path}\x00{query_params or ''}\x00{user_agent}\x00{request_body or ''}"):
+            return None
+        return {"allowed": True, "cached": True, "policy_version": self._policy_version}
+    
+    def submit_event(self, method: str, path: str, source_ip: str,
+                     user_agent: Optional[str] = None, headers: Optional[Dict] = None,
+                     query_params: Optional[str] = None, request_body: Optional[str] = None,
+                     body_truncated: bool = False) -> None:
+        """Queue a security event for background batch analysis (non-blocking)"""
+        event = self._build_event(method, path, source_ip, user_agent, headers,
+                                  query_params, request_body, body_truncated)
+        if self._worker is None:
+            with self._worker_lock:
+                if self._worker is None:
+                    self._worker = threading.Thread(target=self._drain_loop, name="guardial-drain", daemon=True)
+                    self._worker.start()
+                    # Daemon threads die with the interpreter; ship the backlog first
+                    atexit.register(self.flush)
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            if self.config.debug:
+                print("[Guardial SDK] Event queue full, dropping event")
+    
+    def _drain_loop(self) -> None:
+        """Collect up to batch_size events or flush_interval seconds, then ship them"""
+        stopping = False
+        while not stopping:
+            event = self._queue.get()
+            if event is _STOP:
+                break
+            batch = [event]
+            deadline = time.monotonic() + self.config.flush_interval
+            while len(batch) < self.config.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    event = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if event is _STOP:
+                    stopping = True
+                    break
+                batch.append(event)
+            self._send_batch(batch)
+    
+    def flush(self, timeout: float = 5.0) -> None:
+        """Ship all queued telemetry and stop the background worker (restarted on next submit)"""
+        worker = self._worker
+        if worker is None:
+            return
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            if self.config.debug:
+                print("[Guardial SDK] Event queue full, could not flush")
+            return
+        worker.join(timeout)
+        self._worker = None
+    
+    def _send_batch(self, events: list) -> None:
+        """Ship a batch of events to Guardial"""
+        try:
+            response = self._session.post(
+                self.config.batch_url,
+                data=self._encode_batch(events),
+                timeout=self.config.timeout
+            )
+            response.raise_for_status()
+        except Exception as e:
+            if self.config.debug:
+                print(f"[Guardial SDK] Batch upload failed: {e}")
+    
+    def _event_key(self, fields: bytes) -> bytes:
+        """Cache key over every field sent for analysis (headers, user agent, full captured body)"""
+        return hashlib.blake2b(fields, digest_size=16).digest()
+    
+    def _build_event(self, method: str, path: str, source_ip: str,
+                     user_agent: Optional[str] = None, headers: Optional[Dict] = None,
+                     query_params: Optional[str] = None, request_body: Optional[str] = None,
+                     body_truncated: bool = False) -> Dict:
+        """Build the per-request event fields (customer/session are added at encode time)"""
+        headers = headers or {}
+        if user_agent is None:
+            user_agent = _user_agent(headers)
+        whitelist = self.config.header_whitelist
+        return {
+            "method": method,
+            "path": path,
+            "source_ip": source_ip,
+            "user_agent": user_agent,
+            "headers": {k: v for k, v in headers.items() if k.lower() in whitelist} if whitelist else headers,
+            "query_params": query_params or "",
+            "request_body": request_body or "",
+            "body_truncated": body_truncated,
+            "has_auth": self._has_auth_headers(headers)
+        }
+    
+    def _encode_fields(self, event: Dict) -> bytes:
+        """Serialize the per-request event fields (caller headers may have non-str keys)"""
+        return _dumps(event)
+    
+    def _encode_event(self, event: Dict) -> bytes:
+        """Serialize an event, splicing in the pre-encoded customer/session fields"""
+        return self._event_prefix + self._encode_fields(event)[1:]
+    
+    def _encode_batch(self, events: list) -> bytes:
+        """Serialize a batch of events as a JSON array"""
+        return b'[' + b','.join(self._encode_event(e) for e in events) + b']'
+    
     def prompt_guard(self, input_text: str, context: Optional[Dict] = None) -> Dict:
         """Analyze an LLM prompt for injection"""
         request_data = {
@@ -74,14 +390,13 @@ class GuardialClient:
         }
         
         try:
-            response = requests.post(
-                f"{self.config.endpoint}/api/llm/guard",
-                json=request_data,
-                headers={"X-API-Key": self.config.api_key},
+            response = self._session.post(
+                self.config.llm_url,
+                data=_dumps(request_data),
                 timeout=self.config.timeout
             )
             response.raise_for_status()
-            return response.json()
+            return orjson.loads(response.content)
         except Exception as e:
             if self.config.debug:
                 print(f"[Guardial SDK] LLM Guard failed: {e}")
@@ -90,12 +405,12 @@ class GuardialClient:
     def health_check(self) -> Dict:
         """Check Guardial service health"""
         try:
-            response = requests.get(
-                f"{self.config.endpoint}/health",
+            response = self._session.get(
+                self.config.health_url,
                 timeout=self.config.timeout
             )
             response.raise_for_status()
-            return response.json()
+            return orjson.loads(response.content)
         except Exception as e:
             return {"success": False, "error": str(e)}
     
@@ -111,80 +426,352 @@ class GuardialClient:
     
     def _has_auth_headers(self, headers: Dict) -> bool:
         """Check if headers contain authentication"""
-        auth_headers = ['authorization', 'x-api-key', 'x-auth-token']
-        return any(h.lower() in auth_headers for h in headers.keys())
+        # Fast path for the common spellings before the lowercased scan
+        if 'authorization' in headers or 'Authorization' in headers:
+            return True
+        return not _AUTH_HEADER_SET.isdisjoint(h.lower() for h in headers)
 
-# Global client instance (lazy initialization)
+class AsyncGuardialClient(GuardialClient):
+    """
+    Async client for asyncio frameworks (FastAPI/Starlette).
+    Requests multiplex over a shared HTTP/2 connection instead of
+    blocking the event loop.
+    """
+    # May be constructed inside the running loop; the policy is fetched on first use instead
+    _fetch_policy_on_init = False
+    
+    def __init__(self, config: Optional[GuardialConfig] = None):
+        super().__init__(config)
+        import httpx
+        self._aclient = httpx.AsyncClient(
+            http2=True,
+            timeout=self.config.timeout,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            headers={"X-API-Key": self.config.api_key, "Content-Type": "application/json"}
+        )
+        # In-flight analyses on the event loop, keyed like the verdict cache
+        self._ainflight: Dict[bytes, asyncio.Future] = {}
+        # Created on first use so they bind to the running event loop
+        self._aqueue: Optional[asyncio.Queue] = None
+        self._drain_task: Optional[asyncio.Task] = None
+    
+    async def analyze_event_async(self, method: str, path: str, source_ip: str,
+                                  user_agent: Optional[str] = None, headers: Optional[Dict] = None,
+                                  query_params: Optional[str] = None, request_body: Optional[str] = None,
+                                  body_truncated: bool = False) -> Dict:
+        """Analyze a security event without blocking the event loop"""
+        if self.config.local_policy:
+            if time.monotonic() >= self._policy_expires:
+                await self._refresh_policy_async()
+            verdict = self._local_verdict(path, query_params, user_agent, headers, request_body)
+            if verdict is not None:
+                return verdict
+        
+        try:
+            event = self._build_event(method, path, source_ip, user_agent, headers,
+                                      query_params, request_body, body_truncated)
+            fields = self._encode_fields(event)
+            key = self._event_key(fields)
+        except Exception as e:
+            if self.config.debug:
+                print(f"[Guardial SDK] Analysis failed: {e}")
+            return {"allowed": True, "error": str(e)}
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+        
+        # Coalesce concurrent identical requests onto a single API call
+        while key in self._ainflight:
+            future = self._ainflight[key]
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                # The leader was cancelled (e.g. its client disconnected): retry, possibly as leader
+        
+        future = self._ainflight[key] = asyncio.get_running_loop().create_future()
+        try:
+            verdict = await self._post_event_async(key, self._event_prefix + fields[1:])
+            future.set_result(verdict)
+            return verdict
+        except BaseException as e:
+            if isinstance(e, Exception):
+                future.set_exception(e)
+            else:
+                future.cancel()
+            raise
+        finally:
+            del self._ainflight[key]
+    
+    async def _post_event_async(self, key: bytes, payload: bytes) -> Dict:
+        """Send an encoded event to the API over HTTP/2 and cache allow verdicts"""
+        try:
+            response = await self._aclient.post(
+                self.config.events_url,
+                content=payload
+            )
+            response.raise_for_status()
+            verdict = orjson.loads(response.content)
+            if verdict.get('allowed', True):
+                self._cache.set(key, verdict)
+            return verdict
+        except Exception as e:
+            if self.config.debug:
+                print(f"[Guardial SDK] Analysis failed: {e}")
+            return {"allowed": True, "error": str(e)}
+    
+    async def _refresh_policy_async(self) -> None:
+        """Fetch and compile the local allow/deny policy without blocking the event loop"""
+        self._policy_expires = time.monotonic() + self.config.policy_refresh_interval
+        try:
+            response = await self._aclient.get(self.config.policy_url)
+            response.raise_for_status()
+            self._apply_policy(orjson.loads(response.content))
+        except Exception as e:
+            if self.config.debug:
+                print(f"[Guardial SDK] Policy refresh failed: {e}")
+    
+    def submit_event_nowait(self, method: str, path: str, source_ip: str,
+                            user_agent: Optional[str] = None, headers: Optional[Dict] = None,
+                            query_params: Optional[str] = None, request_body: Optional[str] = None,
+                            body_truncated: bool = False) -> None:
+        """Queue a security event for background batch analysis (must run inside the event loop)"""
+        event = self._build_event(method, path, source_ip, user_agent, headers,
+                                  query_params, request_body, body_truncated)
+        if self._drain_task is None:
+            self._aqueue = asyncio.Queue(maxsize=self.config.max_queue_size)
+            self._drain_task = asyncio.get_running_loop().create_task(self._drain_loop_async())
+        try:
+            self._aqueue.put_nowait(event)
+        except asyncio.QueueFull:
+            if self.config.debug:
+                print("[Guardial SDK] Event queue full, dropping event")
+    
+    async def _drain_loop_async(self) -> None:
+        """Collect up to batch_size events or flush_interval seconds, then ship them"""
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            event = await self._aqueue.get()
+            if event is _STOP:
+                break
+            batch = [event]
+            deadline = loop.time() + self.config.flush_interval
+            while len(batch) < self.config.batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    event = await asyncio.wait_for(self._aqueue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                if event is _STOP:
+                    stopping = True
+                    break
+                batch.append(event)
+            await self._send_batch_async(batch)
+    
+    async def _send_batch_async(self, events: list) -> None:
+        """Ship a batch of events to Guardial over the shared HTTP/2 connection"""
+        try:
+            response = await self._aclient.post(
+                self.config.batch_url,
+                content=self._encode_batch(events)
+            )
+            response.raise_for_status()
+        except Exception as e:
+            if self.config.debug:
+                print(f"[Guardial SDK] Batch upload failed: {e}")
+    
+    async def aclose(self) -> None:
+        """Ship queued telemetry, stop the background drainer and close the HTTP/2 connection pool"""
+        if self._drain_task is not None:
+            await self._aqueue.put(_STOP)
+            await self._drain_task
+            self._drain_task = None
+        await self._aclient.aclose()
+
+# Global client instances (lazy initialization)
 _client: Optional[GuardialClient] = None
+_async_client: Optional[AsyncGuardialClient] = None
+_client_lock = threading.Lock()
 
 def get_client(config: Optional[GuardialConfig] = None) -> GuardialClient:
     """Get or create global Guardial client"""
     global _client
     if _client is None:
-        _client = GuardialClient(config)
+        with _client_lock:
+            if _client is None:
+                # Share the async client's explicit config rather than re-reading the environment
+                if config is None and _async_client is not None:
+                    config = _async_client.config
+                _client = GuardialClient(config)
     return _client
 
+def get_async_client(config: Optional[GuardialConfig] = None) -> AsyncGuardialClient:
+    """Get or create global async Guardial client"""
+    global _async_client
+    if _async_client is None:
+        with _client_lock:
+            if _async_client is None:
+                if config is None and _client is not None:
+                    config = _client.config
+                _async_client = AsyncGuardialClient(config)
+    return _async_client
+
+def _asgi_headers(request) -> Dict[str, str]:
+    """Header dict built from the raw ASGI header pairs, bypassing Starlette's Headers wrapper"""
+    headers = {}
+    for k, v in request.scope['headers']:
+        # First value wins for repeated names, matching dict(request.headers)
+        key = k.decode('latin-1')
+        if key not in headers:
+            headers[key] = v.decode('latin-1')
+    return headers
+
+def _cap_body(data: bytes, cap: int) -> Tuple[str, bool]:
+    """Decode at most cap bytes of an already-buffered body; returns (text, truncated)"""
+    return data[:cap].decode('utf-8', errors='replace'), len(data) > cap
+
+async def _read_capped(request, cap: int):
+    """
+    Read at most cap bytes of a Starlette request body without buffering the rest.
+    Returns (prefix, truncated); consumed chunks are replayed to downstream handlers.
+    """
+    chunks = []
+    size = 0
+    more_body = True
+    while more_body and size <= cap:
+        message = await request.receive()
+        if message["type"] != "http.request":
+            break
+        chunk = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        chunks.append(chunk)
+        size += len(chunk)
+    buffered = b"".join(chunks)
+    
+    if not more_body:
+        # Whole body read: Starlette serves request.body() from this cache downstream
+        request._body = buffered
+        return buffered[:cap], len(buffered) > cap
+    
+    # Replay the buffered prefix, then hand the remaining stream through untouched
+    receive = request._receive
+    replayed = False
+    
+    async def replay_receive():
+        nonlocal replayed
+        if not replayed:
+            replayed = True
+            return {"type": "http.request", "body": buffered, "more_body": True}
+        return await receive()
+    
+    request._receive = replay_receive
+    return buffered[:cap], True
+
+def _compile_prefixes(prefixes) -> "re.Pattern":
+    """Compile path prefixes into a single anchored regex"""
+    return re.compile("^(?:" + "|".join(re.escape(p) for p in prefixes) + ")")
+
+def _find_request_param(func: Callable):
+    """Locate the Request parameter as (positional index, name) at decoration time"""
+    try:
+        params = list(inspect.signature(func).parameters.values())
+    except (TypeError, ValueError):
+        return None, None
+    
+    def is_request_annotation(p):
+        ann = p.annotation
+        if isinstance(ann, str):
+            return ann == 'Request' or ann.endswith('.Request')
+        return (_StarletteHTTPConnection is not None and isinstance(ann, type)
+                and issubclass(ann, _StarletteHTTPConnection))
+    
+    match = next((p for p in params if is_request_annotation(p)), None)
+    if match is None:
+        match = next((p for p in params if p.name == 'request'), None)
+    if match is None:
+        return None, None
+    
+    positional = (inspect.Parameter.POSITIONAL_ONLY, inspect.Parameter.POSITIONAL_OR_KEYWORD)
+    index = params.index(match) if match.kind in positional else None
+    return index, match.name
+
+def _is_request(obj) -> bool:
+    return hasattr(obj, 'method') and hasattr(obj, 'url')
+
 def protect(func: Callable) -> Callable:
     """
     One-liner decorator for protecting routes
     Usage: @guardial.protect
     """
+    req_index, req_name = _find_request_param(func)
+    
     @wraps(func)
     async def async_wrapper(*args, **kwargs):
         # For async functions (FastAPI)
-        client = get_client()
-        # Extract request from args (FastAPI pattern)
-        request = None
-        for arg in args:
-            if hasattr(arg, 'method') and hasattr(arg, 'url'):
-                request = arg
-                break
+        client = get_async_client()
+        # Request position is resolved once from the signature; scan only as a fallback
+        if req_index is not None and len(args) > req_index:
+            request = args[req_index]
+        elif req_name is not None:
+            request = kwargs.get(req_name)
+        else:
+            request = None
+        # One isinstance check when Starlette is available; hasattr scan only as the fallback
+        if _StarletteRequest is not None:
+            resolved = isinstance(request, _StarletteRequest)
+        else:
+            resolved = request is not None and _is_request(request)
+        if not resolved:
+            request = next((a for a in (*args, *kwargs.values()) if _is_request(a)), None)
         
         if request:
             # Analyze request
             source_ip = request.client.host if hasattr(request, 'client') else 'unknown'
             body = await request.body() if hasattr(request, 'body') else b''
+            request_body, truncated = _cap_body(body, client.config.max_body_bytes)
             
-            analysis = client.analyze_event(
+            analysis = await client.analyze_event_async(
                 method=request.method,
                 path=request.url.path,
                 source_ip=source_ip,
-                user_agent=request.headers.get('user-agent'),
-                headers=dict(request.headers),
+                headers=_asgi_headers(request),
                 query_params=str(request.url.query),
-                request_body=body.decode('utf-8', errors='ignore')
+                request_body=request_body,
+                body_truncated=truncated
             )
             
             if not analysis.get('allowed', True):
-                from fastapi import HTTPException
-                raise HTTPException(status_code=403, detail="Request blocked by security policy")
+                raise _FastAPIHTTPException(status_code=403, detail="Request blocked by security policy")
         
         return await func(*args, **kwargs)
     
     def sync_wrapper(*args, **kwargs):
         # For sync functions (Flask)
         client = get_client()
-        from flask import request
+        request = _flask_request
         
         if request:
+            request_body, truncated = _cap_body(request.get_data(), client.config.max_body_bytes)
             analysis = client.analyze_event(
                 method=request.method,
                 path=request.path,
                 source_ip=request.remote_addr or 'unknown',
-                user_agent=request.headers.get('user-agent'),
                 headers=dict(request.headers),
                 query_params=request.query_string.decode(),
-                request_body=request.get_data(as_text=True)
+                request_body=request_body,
+                body_truncated=truncated
             )
             
             if not analysis.get('allowed', True):
-                from flask import abort
-                abort(403, "Request blocked by security policy")
+                _flask_abort(403, "Request blocked by security policy")
         
         return func(*args, **kwargs)
     
     # Detect if function is async
-    import inspect
     if inspect.iscoroutinefunction(func):
         return async_wrapper
     return sync_wrapper
@@ -192,33 +779,48 @@ def protect(func: Callable) -> Callable:
 # FastAPI middleware
 def fastapi_middleware(app, config: Optional[GuardialConfig] = None):
     """FastAPI middleware - one-liner: guardial.fastapi_middleware(app)"""
-    client = get_client(config)
+    client = get_async_client(config)
+    exclude_re = _compile_prefixes(['/health', '/docs', '/openapi.json'])
+    # Flush queued telemetry and close connections when the app shuts down
+    app_lifespan = app.router.lifespan_context
+    
+    @asynccontextmanager
+    async def guardial_lifespan(app_):
+        async with app_lifespan(app_) as state:
+            yield state
+        await client.aclose()
+    
+    app.router.lifespan_context = guardial_lifespan
     
     @app.middleware("http")
     async def guardial_middleware(request, call_next):
         # Skip excluded paths
-        exclude_paths = ['/health', '/docs', '/openapi.json']
-        if any(request.url.path.startswith(p) for p in exclude_paths):
+        if exclude_re.match(request.url.path):
             return await call_next(request)
         
         # Analyze request
         source_ip = request.client.host if hasattr(request, 'client') else 'unknown'
-        body = await request.body()
-        
-        analysis = client.analyze_event(
+        body, truncated = await _read_capped(request, client.config.max_body_bytes)
+        event = dict(
             method=request.method,
             path=request.url.path,
             source_ip=source_ip,
-            user_agent=request.headers.get('user-agent'),
-            headers=dict(request.headers),
+            headers=_asgi_headers(request),
             query_params=str(request.url.query),
-            request_body=body.decode('utf-8', errors='ignore')
+            request_body=body.decode('utf-8', errors='replace'),
+            body_truncated=truncated
         )
         
+        # Telemetry mode: enqueue and keep the API round-trip off the request path
+        if client.config.mode == 'async':
+            client.submit_event_nowait(**event)
+            return await call_next(request)
+        
+        analysis = await client.analyze_event_async(**event)
+        
         if not analysis.get('allowed', True):
-            from fastapi import Response
-            return Response(
-                content=json.dumps({"error": "Request blocked by security policy"}),
+            return _FastAPIResponse(
+                content=orjson.dumps({"error": "Request blocked by security policy"}),
                 status_code=403,
                 media_type="application/json"
             )
@@ -229,31 +831,40 @@ def fastapi_middleware(app, config: Optional[GuardialConfig] = None):
 def flask_middleware(app, config: Optional[GuardialConfig] = None):
     """Flask middleware - one-liner: guardial.flask_middleware(app)"""
     client = get_client(config)
+    exclude_re = _compile_prefixes(['/health', '/static'])
     
     @app.before_request
     def guardial_before_request():
-        from flask import request, abort
+        request = _flask_request
         
         # Skip excluded paths
-        exclude_paths = ['/health', '/static']
-        if any(request.path.startswith(p) for p in exclude_paths):
+        if exclude_re.match(request.path):
             return
         
         # Analyze request
-        analysis = client.analyze_event(
+        request_body, truncated = _cap_body(request.get_data(), client.config.max_body_bytes)
+        event = dict(
             method=request.method,
             path=request.path,
             source_ip=request.remote_addr or 'unknown',
-            user_agent=request.headers.get('user-agent'),
             headers=dict(request.headers),
             query_params=request.query_string.decode(),
-            request_body=request.get_data(as_text=True)
+            request_body=request_body,
+            body_truncated=truncated
         )
         
+        # Telemetry mode: enqueue and keep the API round-trip off the request path
+        if client.config.mode == 'async':
+            client.submit_event(**event)
+            return
+        
+        analysis = client.analyze_event(**event)
+        
         if not analysis.get('allowed', True):
-            abort(403, "Request blocked by security policy")
+            _flask_abort(403, "Request blocked by security policy")
 
-__all__ = ['GuardialClient', 'GuardialConfig', 'protect', 'fastapi_middleware', 'flask_middleware', 'get_client']
+__all__ = ['GuardialClient', 'AsyncGuardialClient', 'GuardialConfig', 'protect', 'fastapi_middleware',
+           'flask_middleware', 'get_client', 'get_async_client']
 
 
 
@@ -27,9 +27,10 @@ setup(
     python_requires=">=3.8",
     install_requires=[
         "requests>=2.28.0",
+        "orjson>=3.6.0",
     ],
     extras_require={
-        "fastapi": ["fastapi>=0.68.0"],
+        "fastapi": ["fastapi>=0.68.0", "httpx[http2]>=0.23.0"],
         "flask": ["flask>=2.0.0"],
     },
 )